@@ -3,6 +3,7 @@
 Debug script to check CDL template issues
 """
 
+import re
 import sys
 from pathlib import Path
 
@@ -41,16 +42,10 @@ def check_cdl_syntax(cdl_file):
         return False
     
     # Check for template variables
-    template_vars = []
-    for line in lines:
-        if '$' in line:
-            # Find template variables
-            import re
-            vars_in_line = re.findall(r'\$(\w+)', line)
-            template_vars.extend(vars_in_line)
+    template_vars = set(re.findall(r'\$(\w+)', content))
     
     if template_vars:
-        print(f"Template variables found: {set(template_vars)}")
+        print(f"Template variables found: {template_vars}")
     
     # Show last few lines
     print("\nLast 3 lines:")
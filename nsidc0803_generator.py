@@ -5,77 +5,157 @@ Modular approach following NSIDC patterns
 """
 
 import datetime as dt
+import functools
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import click
 import yaml
+from netCDF4 import Dataset
 
 from utils import (
     INPUT_DIR,
     OUTPUT_DIR,
-    add_nc_coordinate_values,
+    assemble_file_payload,
+    build_netcdf_direct,
     create_cdl,
     create_netcdf,
-    encode_binary_to_nc,
-    find_binary_file,
+    get_binary_filename,
+    get_combined_output_filename,
+    get_date_range,
     get_output_filename,
+    index_binary_files,
+    probe_binary_layouts,
+    write_payload,
 )
 
+logger = logging.getLogger(__name__)
+
+# Use the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_config(config_path, mtime):
+    """Parse a YAML configuration file; mtime is part of the cache key"""
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
 
 def load_config(config_file):
-    """Load YAML configuration file"""
-    with open(config_file, "r") as f:
-        return yaml.safe_load(f)
+    """Load YAML configuration file (cached; do not mutate the result)"""
+    return _load_config(str(config_file), os.path.getmtime(config_file))
+
+
+# Generator used by pool worker processes, set once per worker
+_worker_generator = None
+
+
+def _init_worker(generator, log_level):
+    """Store the generator in a worker process so tasks don't re-pickle it"""
+    global _worker_generator
+    _worker_generator = generator
+
+    # No-op for forked workers, which inherit the parent's logging setup
+    logging.basicConfig(level=log_level, format="%(message)s", stream=sys.stdout)
+
+
+def _generate_ncfile_task(task):
+    """Run one (date, hemisphere, binary_file) task in a worker"""
+    return _worker_generator.generate_ncfile(*task)
 
 
 class NetCDFGenerator:
     """Main NetCDF generator class following NSIDC patterns"""
 
-    def __init__(self, binary_dir, output_dir, template_file):
+    def __init__(self, binary_dir, output_dir, template_file, legacy_cdl=False):
         self.binary_dir = Path(binary_dir)
         self.output_dir = Path(output_dir)
         self.template_file = Path(template_file)
+        self.legacy_cdl = legacy_cdl
+
+        # Index of all binaries under binary_dir; only built if a file is not
+        # in one of the known layouts (see find_binary_file)
+        self._binary_index = None
+
+    def find_binary_file(self, date, hemisphere):
+        """
+        Find the binary file for date/hemisphere
 
-    def generate_ncfile(self, date, hemisphere):
+        The known date-based layouts are probed first (a few stats). Only
+        when that misses is binary_dir walked, once, into an index that is
+        reused for the rest of the run.
+        """
+        filename = get_binary_filename(date, hemisphere)
+
+        binary_file = probe_binary_layouts(self.binary_dir, date, filename)
+        if binary_file is None:
+            if self._binary_index is None:
+                self._binary_index = index_binary_files(self.binary_dir)
+            binary_file = self._binary_index.get(filename)
+
+        return binary_file
+
+    def generate_ncfile(self, date, hemisphere, binary_file=None):
         """
         Create netCDF4 file containing AMSR2 data for date/hemisphere
         Following the pattern from your NSIDC-0081 code
+
+        binary_file may be passed in when it has already been looked up.
         """
-        print(f"  Creating {date}: {hemisphere}")
+        logger.debug(f"  Creating {date}: {hemisphere}")
 
         # Find binary file
-        binary_file = find_binary_file(self.binary_dir, date, hemisphere)
+        if binary_file is None:
+            binary_file = self.find_binary_file(date, hemisphere)
         if not binary_file:
-            print(f"No binary file found: {date} {hemisphere}")
+            logger.warning(f"No binary file found: {date} {hemisphere}")
             return False
 
-        print(f"    Found binary: {binary_file}")
+        logger.debug(f"    Found binary: {binary_file}")
 
         # Create output filename
         output_file = get_output_filename(self.output_dir, date, hemisphere)
 
         try:
-            # Create CDL from template
-            print("    Creating CDL...")
-            temp_cdl = create_cdl(self.template_file, output_file, date, hemisphere)
-
-            # Generate NetCDF from CDL
-            print("    Generating NetCDF...")
-            create_netcdf(temp_cdl, output_file)
-
-            # Add coordinate data
-            print("    Adding coordinates...")
-            add_nc_coordinate_values(output_file, date, hemisphere)
-
-            # Add binary data
-            print("    Adding ice concentration data...")
-            encode_binary_to_nc(output_file, binary_file, hemisphere)
-
-            print(f"    ✅ Created: {output_file}")
+            # Read binary data before creating the output file
+            logger.debug("    Reading ice concentration data...")
+            payload = assemble_file_payload([binary_file], [date], hemisphere)
+
+            if self.legacy_cdl:
+                # Create CDL from template
+                logger.debug("    Creating CDL...")
+                temp_cdl = create_cdl(self.template_file, output_file, date, hemisphere)
+
+                # Generate NetCDF from CDL
+                logger.debug("    Generating NetCDF...")
+                create_netcdf(temp_cdl, output_file)
+                ds = Dataset(output_file, "a")
+            else:
+                # Generate NetCDF directly with netCDF4; written out on close
+                logger.debug("    Generating NetCDF...")
+                ds = build_netcdf_direct(output_file, date, hemisphere)
+
+            # Add coordinates and binary data
+            logger.debug("    Adding coordinates and ice concentration data...")
+            try:
+                with ds:
+                    write_payload(ds, payload, hemisphere)
+            except BaseException:
+                # Closing wrote out whatever was there; don't leave it behind
+                output_file.unlink(missing_ok=True)
+                raise
+
+            # Logged at debug level: one of many files per run, and the run
+            # summary reports the totals
+            logger.debug(f"    ✅ Created: {output_file}")
             return True
 
         except Exception as e:
-            print(f"    ❌ Error: {e}")
+            logger.error(f"    ❌ Error: {e}")
             return False
 
     def generate_ncfiles(self, date, hemispheres=None):
@@ -83,7 +163,7 @@ class NetCDFGenerator:
         Generate NetCDF4 files for this date
         Following the pattern from your NSIDC-0081 code
         """
-        print(f"Processing date: {date}")
+        logger.debug(f"Processing date: {date}")
 
         if hemispheres is None:
             hemispheres = ["north", "south"]
@@ -95,29 +175,109 @@ class NetCDFGenerator:
 
         return success_count == len(hemispheres)
 
-    def generate_netcdf_for_range(self, start_date, end_date, hemispheres=None):
+    def generate_netcdf_for_range(
+        self, start_date, end_date, hemispheres=None, workers=None
+    ):
         """
         Generate NetCDF files for a date range
         Following the pattern from your NSIDC-0081 code
+
+        Each (date, hemisphere) file is independent, so they are spread over
+        a pool of up to `workers` processes (defaults to the CPU count), never
+        more than there are files; with a single worker everything runs in
+        this process.
         """
-        day_delta = dt.timedelta(days=1)
-        total_success = 0
+        if hemispheres is None:
+            hemispheres = ["north", "south"]
+
+        # Look up inputs here, so any fallback walk of binary_dir happens once
+        # in this process rather than once per worker
+        tasks = []
         total_attempted = 0
+        for date in get_date_range(start_date, end_date):
+            for hemisphere in hemispheres:
+                total_attempted += 1
+                binary_file = self.find_binary_file(date, hemisphere)
+                if binary_file:
+                    tasks.append((date, hemisphere, binary_file))
+                else:
+                    logger.warning(f"No binary file found: {date} {hemisphere}")
+
+        # Don't fork more workers than there are files to write
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+
+        if workers <= 1:
+            results = [self.generate_ncfile(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self, logging.getLogger().level),
+            ) as executor:
+                results = list(executor.map(_generate_ncfile_task, tasks))
+
+        return sum(results), total_attempted
+
+    def generate_combined(self, start_date, end_date, hemisphere):
+        """
+        Create one netCDF4 file holding every available date in the range
+        along the time axis, instead of one file per date
+        """
+        logger.debug(f"  Creating {start_date} to {end_date}: {hemisphere}")
 
-        current_date = start_date
-        while current_date <= end_date:
-            if hemispheres is None:
-                process_hemispheres = ["north", "south"]
+        # Find binary files
+        dates = []
+        binary_files = []
+
+        for date in get_date_range(start_date, end_date):
+            binary_file = self.find_binary_file(date, hemisphere)
+            if binary_file:
+                dates.append(date)
+                binary_files.append(binary_file)
             else:
-                process_hemispheres = hemispheres
+                logger.warning(f"No binary file found: {date} {hemisphere}")
 
-            total_attempted += len(process_hemispheres)
-            if self.generate_ncfiles(current_date, process_hemispheres):
-                total_success += len(process_hemispheres)
+        if not dates:
+            return False
+
+        logger.debug(f"    Found {len(binary_files)} binary files")
+
+        # Create output filename
+        output_file = get_combined_output_filename(
+            self.output_dir, start_date, end_date, hemisphere
+        )
 
-            current_date += day_delta
+        try:
+            # Read all binary data into one (time, y, x) buffer
+            logger.debug("    Reading ice concentration data...")
+            payload = assemble_file_payload(binary_files, dates, hemisphere)
+
+            # Generate NetCDF directly with netCDF4; the time coverage is that
+            # of the dates actually found, not of the requested range
+            logger.debug("    Generating NetCDF...")
+            ds = build_netcdf_direct(
+                output_file, dates[0], hemisphere, end_date=dates[-1]
+            )
+
+            # Add coordinates and binary data; written out on close
+            logger.debug("    Adding coordinates and ice concentration data...")
+            try:
+                with ds:
+                    write_payload(ds, payload, hemisphere)
+            except BaseException:
+                # Closing wrote out whatever was there; don't leave it behind
+                output_file.unlink(missing_ok=True)
+                raise
+
+            # Logged at info level: --combined writes at most one file per
+            # hemisphere, and its name (which encodes the date range) is the
+            # run's only output
+            logger.info(f"    ✅ Created: {output_file}")
+            return True
 
-        return total_success, total_attempted
+        except Exception as e:
+            logger.error(f"    ❌ Error: {e}")
+            return False
 
 
 @click.command()
@@ -143,7 +303,7 @@ class NetCDFGenerator:
     required=True,
     type=click.Path(exists=True),
     default="nsidc0803_template.cdl",
-    help="CDL template file",
+    help="CDL template file (used with --legacy-cdl)",
 )
 @click.option(
     "--start-date",
@@ -167,8 +327,37 @@ class NetCDFGenerator:
     default="both",
     help="Hemisphere to process",
 )
+@click.option(
+    "--legacy-cdl",
+    is_flag=True,
+    help="Build files from the CDL template with ncgen instead of netCDF4",
+)
+@click.option(
+    "--combined",
+    is_flag=True,
+    help="Write the whole date range to one file per hemisphere",
+)
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes, defaults to the number of CPUs"
+    " (not allowed with --combined)",
+)
 @click.option("--verbose", "-v", is_flag=True, help="Verbose output")
-def main(binary_dir, output_dir, template, start_date, end_date, hemisphere, verbose):
+def main(
+    binary_dir,
+    output_dir,
+    template,
+    start_date,
+    end_date,
+    hemisphere,
+    legacy_cdl,
+    combined,
+    workers,
+    verbose,
+):
     """
     Generate NSIDC-0803 NetCDF files from AMSR2 binary data.
 
@@ -188,19 +377,33 @@ def main(binary_dir, output_dir, template, start_date, end_date, hemisphere, ver
     if end_date is None:
         end_date = start_date
 
-    if verbose:
-        print(f"Binary directory: {binary_dir}")
-        print(f"Output directory: {output_dir}")
-        print(f"Template file: {template}")
-        print(
-            f"Date range: {start_date.strftime('%Y-%m-%d')}"
-            f" to {end_date.strftime('%Y-%m-%d')}"
-        )
-        print(f"Hemisphere: {hemisphere}")
-        print()
+    if combined and legacy_cdl:
+        raise click.UsageError("--combined cannot be used with --legacy-cdl")
+
+    if combined and workers:
+        raise click.UsageError("--combined cannot be used with --workers")
+
+    # Log to stdout, where progress and the summary were printed before
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(message)s",
+        stream=sys.stdout,
+    )
+
+    logger.debug(f"Binary directory: {binary_dir}")
+    logger.debug(f"Output directory: {output_dir}")
+    logger.debug(f"Template file: {template}")
+    logger.debug(
+        f"Date range: {start_date.strftime('%Y-%m-%d')}"
+        f" to {end_date.strftime('%Y-%m-%d')}"
+    )
+    logger.debug(f"Hemisphere: {hemisphere}")
+    logger.debug(f"Legacy CDL: {legacy_cdl}")
+    logger.debug(f"Combined: {combined}")
+    logger.debug(f"Workers: {workers or 'all CPUs'}")
 
     # Initialize generator
-    generator = NetCDFGenerator(binary_dir, output_dir, template)
+    generator = NetCDFGenerator(binary_dir, output_dir, template, legacy_cdl)
 
     # Determine hemispheres to process
     if hemisphere == "both":
@@ -209,13 +412,19 @@ def main(binary_dir, output_dir, template, start_date, end_date, hemisphere, ver
         hemispheres = [hemisphere]
 
     # Process date range
-    total_success, total_attempted = generator.generate_netcdf_for_range(
-        start_date, end_date, hemispheres
-    )
+    if combined:
+        total_attempted = len(hemispheres)
+        total_success = sum(
+            generator.generate_combined(start_date, end_date, hemisphere)
+            for hemisphere in hemispheres
+        )
+    else:
+        total_success, total_attempted = generator.generate_netcdf_for_range(
+            start_date, end_date, hemispheres, workers
+        )
 
     # Summary
-    print()
-    print(
+    logger.info(
         f"Processing complete: {total_success}/{total_attempted}"
         " files created successfully"
     )
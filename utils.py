@@ -3,10 +3,12 @@ Utility functions for NSIDC-0803 NetCDF generation
 """
 
 import datetime as dt
+import functools
 import os
 import subprocess
 from pathlib import Path
 from string import Template
+from types import MappingProxyType
 
 import numpy as np
 import pyproj
@@ -16,9 +18,144 @@ INPUT_DIR = "/disks/sidads_staging/DATASETS/nsidc0740_AS2_nrt_nasateam_seaice_v1
 OUTPUT_DIR = "/share/apps/nsidc0803/"
 # OUTPUT_DIR = "/disks/sidads_staging/DATASETS/nsidc0803_daily_a2_seaice_conc/"
 
-
+SOFTWARE_VERSION_ID = "v2.0"
+SOFTWARE_REPOSITORY = "https://github.com/nsidc/nsidc0803"
+
+# Subdirectory layouts (strftime formats) probed for binary files before
+# falling back to a recursive search; "" is binary_dir itself
+BINARY_DIR_LAYOUTS = ("%Y.%m.%d", "%Y/%m", "%Y", "")
+
+# Schema used by build_netcdf_direct(); mirrors nsidc0803_template.cdl
+TIME_ATTRS = {
+    "standard_name": "time",
+    "calendar": "standard",
+    "coverage_content_type": "coordinate",
+    "long_name": "ANSI date",
+    "units": "days since 1970-01-01",
+    "axis": "T",
+}
+
+X_ATTRS = {
+    "standard_name": "projection_x_coordinate",
+    "coverage_content_type": "coordinate",
+    "long_name": "x",
+    "units": "meters",
+    "axis": "X",
+}
+
+Y_ATTRS = {
+    "standard_name": "projection_y_coordinate",
+    "coverage_content_type": "coordinate",
+    "long_name": "y",
+    "units": "meters",
+    "axis": "Y",
+}
+
+ICECON_FILL_VALUE = np.uint8(255)
+
+ICECON_ATTRS = {
+    "long_name": "Sea Ice Concentration",
+    "standard_name": "sea_ice_area_fraction",
+    "units": "1",
+    "valid_range": np.array([0, 250], dtype=np.uint8),
+    "grid_mapping": "crs",
+    "coverage_content_type": "image",
+    "coordinates": "time y x",
+    "flag_values": np.array([251, 252, 253, 254], dtype=np.uint8),
+    "flag_meanings": "pole_hole_mask unused coast land",
+    "packing_convention": "netCDF",
+    "packing_convention_description": "unpacked = scale_factor*packed + add_offset",
+    "scale_factor": 0.004,
+    "add_offset": 0.0,
+}
+
+# Global attributes; the $-placeholders of the CDL are filled in per file
+GLOBAL_ATTRS = {
+    "title": "AMSR2 Daily Polar Gridded Sea Ice Concentrations",
+    "Conventions": "CF-1.12, ACDD-1.3",
+    "source": "Stewart, J. S., Meier, W. N., Wilcox, H., Scott, D. J. & Marowitz,"
+    " R. (2025). AMSR2 Daily Polar Gridded Brightness Temperatures. (NSIDC-0802,"
+    " Version 2). [Data Set]. Boulder, Colorado USA. National Snow and Ice Data"
+    " Center. https://doi.org/10.5067/DEYP05J7GMSH.",
+    "summary": "This data set provides a daily map of sea ice concentrations for"
+    " both the Northern and Southern hemispheres.",
+    "publisher_institution": "National Snow and Ice Data Center/Cooperative"
+    " Institute for Research in Environmental Sciences/University of Colorado at"
+    " Boulder/Boulder, CO",
+    "publisher_name": "NASA National Snow and Ice Data Center Distributed Active"
+    " Archive Center",
+    "publisher_type": "institution",
+    "publisher_url": "https://nsidc.org/daac",
+    "publisher_email": "nsidc@nsidc.org",
+    "program": "NASA Earth Science Data and Information System (ESDIS)",
+    "standard_name_vocabulary": "CF Standard Name Table (Version 91, 14 May 2025)",
+    "keywords": "SEA ICE > SEA ICE CONCENTRATION",
+    "keywords_vocabulary": "NASA Global Change Master Directory (GCMD) Earth"
+    " Science Keywords, Version 20",
+    "platform": "GCOM-W1 > Global Change Observation Mission 1st-Water",
+    "platform_vocabulary": "NASA Global Change Master Directory (GCMD) Earth"
+    " Science Keywords, Version 20",
+    "instrument": "AMSR2 > Advanced Microwave Scanning Radiometer 2",
+    "instrument_vocabulary": "NASA Global Change Master Directory (GCMD) Earth"
+    " Science Keywords, Version 20",
+    "license": "Access Constraint: These data are freely, openly, and fully"
+    " accessible; Use Constraint: These data are freely, openly, and fully"
+    " available to use without restrictions, provided that you cite the data"
+    " according to the recommended citation included here.",
+    "creator_name": "NASA National Snow and Ice Data Center Distributed Active"
+    " Archive Center",
+    "contributor_name": "Stewart J.S., Meier W.N., Wilcox, H., Scott D.J.,"
+    " Marowitz, R., Calme, J.",
+    "contributor_role": "scientific_programmer, project_scientist,"
+    " software_developer, project_lead, software_developer, data_manager",
+    "citation": "Stewart, J.S., Meier, W.N., Marowitz, R., Scott, D.J. & Wilcox,"
+    " H. (2025). AMSR2 Daily Polar Gridded Sea Ice Concentrations. (NSIDC-0803,"
+    " Version 2). [Data Set]. Boulder, Colorado USA. National Snow and Ice Data"
+    " Center. https://doi.org/10.5067/W13AO54SS7CW.",
+    "id": "10.5067/W13AO54SS7CW",
+    "metadata_link": "https://doi.org/10.5067/W13AO54SS7CW",
+    "product_version": "v2.0",
+    "software_version_id": None,
+    "software_repository": None,
+    "geospatial_bounds_crs": None,
+    "geospatial_bounds": None,
+    "cdm_data_type": "Grid",
+    "processing_level": "Level 3",
+    "geospatial_lat_min": None,
+    "geospatial_lat_max": None,
+    "geospatial_lon_min": np.int32(-180),
+    "geospatial_lon_max": np.int32(180),
+    "geospatial_lat_units": "degrees_north",
+    "geospatial_lon_units": "degrees_east",
+    "time_coverage_resolution": "P1D",
+    "time_coverage_start": None,
+    "time_coverage_end": None,
+    "time_coverage_duration": "P1D",
+    "date_created": None,
+    "date_modified": None,
+}
+
+
+def _north_pole_hole_indices():
+    """Return (row, col) indices of the northern pole hole"""
+    kernel = np.zeros((448, 304), dtype=bool)
+    kernel[229, 150:158] = True
+    kernel[230:238, 149:159] = True
+    kernel[238, 150:158] = True
+    return np.nonzero(kernel)
+
+
+# Input-independent, so only computed once
+NORTH_POLE_HOLE = _north_pole_hole_indices()
+
+
+@functools.lru_cache(maxsize=1)
 def get_grid_params():
-    """Return grid parameters for both hemispheres"""
+    """Return grid parameters for both hemispheres
+
+    The result is built once per process (pyproj CRS lookups included) and
+    shared by all callers, so it is returned as read-only mappings.
+    """
     north_crs = pyproj.CRS("EPSG:3411")
     south_crs = pyproj.CRS("EPSG:3412")
 
@@ -45,45 +182,117 @@ def get_grid_params():
         }
     )
 
-    return {
-        "north": {
-            "xdim": 304,
-            "ydim": 448,
-            "crs_attrs": north_cf,
-            "geospatial_bounds_crs": "EPSG:3411",
-            "geospatial_bounds": "POLYGON ((-3850000 5850000, 3750000 5850000,"
-            "3750000 -5350000, -3850000 -5350000, -3850000 5850000))",
-            "geospatial_lat_min": 30.980564,
-            "geospatial_lat_max": 90.0,
-        },
-        "south": {
-            "xdim": 316,
-            "ydim": 332,
-            "crs_attrs": south_cf,
-            "geospatial_bounds_crs": "EPSG:3412",
-            "geospatial_bounds": "POLYGON ((-3950000 4350000, 3950000 4350000,"
-            "3950000 -3950000, -3950000 -3950000, -3950000 4350000))",
-            "geospatial_lat_min": -90.0,
-            "geospatial_lat_max": -39.23089,
-        },
-    }
+    # GeoTransform is "x0 dx 0 y0 0 dy"; keep the numbers alongside the string
+    north_gt = [float(v) for v in north_cf["GeoTransform"].split()]
+    south_gt = [float(v) for v in south_cf["GeoTransform"].split()]
+
+    return MappingProxyType(
+        {
+            "north": MappingProxyType(
+                {
+                    "xdim": 304,
+                    "ydim": 448,
+                    "x0": north_gt[0],
+                    "dx": north_gt[1],
+                    "y0": north_gt[3],
+                    "dy": north_gt[5],
+                    "crs_attrs": MappingProxyType(north_cf),
+                    "geospatial_bounds_crs": "EPSG:3411",
+                    "geospatial_bounds": "POLYGON ((-3850000 5850000,"
+                    " 3750000 5850000,3750000 -5350000, -3850000 -5350000,"
+                    " -3850000 5850000))",
+                    "geospatial_lat_min": 30.980564,
+                    "geospatial_lat_max": 90.0,
+                }
+            ),
+            "south": MappingProxyType(
+                {
+                    "xdim": 316,
+                    "ydim": 332,
+                    "x0": south_gt[0],
+                    "dx": south_gt[1],
+                    "y0": south_gt[3],
+                    "dy": south_gt[5],
+                    "crs_attrs": MappingProxyType(south_cf),
+                    "geospatial_bounds_crs": "EPSG:3412",
+                    "geospatial_bounds": "POLYGON ((-3950000 4350000,"
+                    " 3950000 4350000,3950000 -3950000, -3950000 -3950000,"
+                    " -3950000 4350000))",
+                    "geospatial_lat_min": -90.0,
+                    "geospatial_lat_max": -39.23089,
+                }
+            ),
+        }
+    )
+
+
+def get_date_range(start_date, end_date):
+    """Return every date from start_date to end_date, inclusive"""
+    day_delta = dt.timedelta(days=1)
+    num_days = (end_date - start_date).days + 1
 
+    return [start_date + i * day_delta for i in range(num_days)]
 
-def find_binary_file(binary_dir, date, hemisphere):
-    """Find the binary file for a specific date and hemisphere"""
+
+def get_binary_filename(date, hemisphere):
+    """Return the binary input filename for a specific date and hemisphere"""
     ymd = date.strftime("%Y%m%d")
     hem_code = "n" if hemisphere == "north" else "s"
 
-    filename = f"nt_{ymd}_as2_nrt_{hem_code}.bin"
+    return f"nt_{ymd}_as2_nrt_{hem_code}.bin"
+
+
+def index_binary_files(binary_dir):
+    """
+    Map binary filenames under binary_dir to their paths in a single pass
 
-    # Search in binary directory and subdirectories
-    for root, dirs, files in os.walk(binary_dir):
-        if filename in files:
-            return Path(root) / filename
+    Directories are visited in the same top-down order as os.walk; if a
+    filename occurs more than once, the first one visited wins.
+    """
+    index = {}
+
+    def scan(directory):
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(".bin"):
+                        index.setdefault(entry.name, Path(entry.path))
+        except OSError:
+            # Skip unreadable directories, like os.walk does by default
+            return
+
+        for subdir in subdirs:
+            scan(subdir)
+
+    scan(binary_dir)
+    return index
+
+
+def probe_binary_layouts(binary_dir, date, filename):
+    """Look for filename in the usual date-based layouts, one stat each"""
+    for layout in BINARY_DIR_LAYOUTS:
+        binary_file = Path(binary_dir) / date.strftime(layout) / filename
+        if binary_file.is_file():
+            return binary_file
 
     return None
 
 
+# Output directories already created by this process
+_CREATED_DIRS = set()
+
+
+def _ensure_dir(directory):
+    """mkdir -p, skipping the syscall for directories created earlier"""
+    if directory not in _CREATED_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(directory)
+
+
 def get_output_filename(output_dir, date, hemisphere):
     """Create output NetCDF filename following NSIDC conventions"""
     ymd = date.strftime("%Y%m%d")
@@ -91,36 +300,76 @@ def get_output_filename(output_dir, date, hemisphere):
 
     # Create date-based subdirectory
     date_dir = Path(output_dir) / date.strftime("%Y.%m.%d")
-    date_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(date_dir)
 
     filename = f"NSIDC-0803_SEAICE_AMSR2_{hem_code}_{ymd}_v2.0.nc"
     return date_dir / filename
 
 
+def get_combined_output_filename(output_dir, start_date, end_date, hemisphere):
+    """Create output filename for a NetCDF file spanning a date range"""
+    ymd_range = f"{start_date.strftime('%Y%m%d')}-{end_date.strftime('%Y%m%d')}"
+    hem_code = hemisphere[0].upper()  # N or S
+
+    output_dir = Path(output_dir)
+    _ensure_dir(output_dir)
+
+    filename = f"NSIDC-0803_SEAICE_AMSR2_{hem_code}_{ymd_range}_v2.0.nc"
+    return output_dir / filename
+
+
+@functools.lru_cache(maxsize=4)
+def _load_template(template_path, mtime):
+    """Read and compile a CDL template; mtime is part of the cache key"""
+    with open(template_path, "r") as f:
+        return Template(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def _hemisphere_attrs(hemisphere):
+    """Return the global metadata values that only depend on the hemisphere"""
+    grid_params = get_grid_params()
+    params = grid_params[hemisphere]
+
+    return MappingProxyType(
+        {
+            "software_version_id": SOFTWARE_VERSION_ID,
+            "software_repository": SOFTWARE_REPOSITORY,
+            "geospatial_bounds_crs": params["geospatial_bounds_crs"],
+            "geospatial_bounds": params["geospatial_bounds"],
+            "geospatial_lat_min": params["geospatial_lat_min"],
+            "geospatial_lat_max": params["geospatial_lat_max"],
+        }
+    )
+
+
+def _utc_timestamp():
+    """Return the current UTC time formatted for date_created/date_modified"""
+    return dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
 def create_cdl(template_file, output_path, date, hemisphere):
     """Create CDL file from template with substitutions"""
     grid_params = get_grid_params()
     params = grid_params[hemisphere]
+    now = _utc_timestamp()
 
     # Template substitutions
-    substitutions = {
-        "xdim": params["xdim"],
-        "ydim": params["ydim"],
-        "geospatial_bounds_crs": params["geospatial_bounds_crs"],
-        "geospatial_bounds": params["geospatial_bounds"],
-        "geospatial_lat_min": params["geospatial_lat_min"],
-        "geospatial_lat_max": params["geospatial_lat_max"],
-        "time_coverage_start": date.strftime("%Y-%m-%dT00:00:00Z"),
-        "time_coverage_end": date.strftime("%Y-%m-%dT23:59:59Z"),
-        "date_created": dt.datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "date_modified": dt.datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "software_version_id": "v2.0",
-        "software_repository": "https://github.com/nsidc/nsidc0803",
-    }
+    substitutions = dict(_hemisphere_attrs(hemisphere))
+    substitutions.update(
+        {
+            "xdim": params["xdim"],
+            "ydim": params["ydim"],
+            "time_coverage_start": date.strftime("%Y-%m-%dT00:00:00Z"),
+            "time_coverage_end": date.strftime("%Y-%m-%dT23:59:59Z"),
+            "date_created": now,
+            "date_modified": now,
+        }
+    )
 
-    # Read and substitute template
-    with open(template_file, "r") as f:
-        template = Template(f.read())
+    # Read (cached) and substitute template
+    template_file = Path(template_file)
+    template = _load_template(str(template_file), template_file.stat().st_mtime)
 
     cdl_content = template.safe_substitute(substitutions)
 
@@ -149,54 +398,108 @@ def create_netcdf(cdl_path, nc_path):
     return nc_path
 
 
-def add_nc_coordinate_values(nc_path, date, hemisphere):
-    """Add coordinate values to NetCDF file"""
+def build_netcdf_direct(nc_path, date, hemisphere, end_date=None):
+    """
+    Create NetCDF file skeleton with netCDF4, without a CDL/ncgen round trip
+
+    Returns the Dataset still open for writing the data. It is held in memory
+    (diskless) and written to nc_path once, when the caller closes it.
+
+    With end_date the file covers date..end_date instead of a single day.
+    """
     grid_params = get_grid_params()
     params = grid_params[hemisphere]
-    crs_attrs = params["crs_attrs"]
-
-    with Dataset(nc_path, "a") as ds:
-        # Set time coordinate
-        time_var = ds.variables["time"]
-        file_time = date2num(date, units=time_var.units, calendar=time_var.calendar)
-        time_var[0] = file_time
-
-        # Set x coordinates (25km resolution)
-        xdim = params["xdim"]
-        geotransform = crs_attrs["GeoTransform"].split()
-        x_origin = float(geotransform[0])
-        x_pixel_size = float(geotransform[1])
-
-        x_vals = np.linspace(
-            x_origin + x_pixel_size / 2, x_origin + (xdim - 0.5) * x_pixel_size, xdim
-        )
-        ds.variables["x"][:] = x_vals
+    now = _utc_timestamp()
+    last_date = date if end_date is None else end_date
 
-        # Set y coordinates (25km resolution)
-        ydim = params["ydim"]
-        y_origin = float(geotransform[3])
-        y_pixel_size = float(geotransform[5])  # Negative for north-up
+    global_attrs = dict(GLOBAL_ATTRS)
+    global_attrs.update(_hemisphere_attrs(hemisphere))
+    global_attrs.update(
+        {
+            "time_coverage_start": date.strftime("%Y-%m-%dT00:00:00Z"),
+            "time_coverage_end": last_date.strftime("%Y-%m-%dT23:59:59Z"),
+            "time_coverage_duration": f"P{(last_date - date).days + 1}D",
+            "date_created": now,
+            "date_modified": now,
+        }
+    )
 
-        y_vals = np.linspace(
-            y_origin + y_pixel_size / 2, y_origin + (ydim - 0.5) * y_pixel_size, ydim
-        )
-        ds.variables["y"][:] = y_vals
+    # One chunk per time step, so each day's grid is deflated in one pass.
+    # Shuffle is off (netCDF4 defaults it on): it is a no-op for a one-byte
+    # type, and this matches the _DeflateLevel-only CDL template.
+    icecon_options = {
+        "fill_value": ICECON_FILL_VALUE,
+        "zlib": True,
+        "complevel": 1,
+        "shuffle": False,
+        "chunksizes": (1, params["ydim"], params["xdim"]),
+    }
+
+    if nc_path.exists():
+        nc_path.unlink()
+
+    ds = Dataset(nc_path, "w", format="NETCDF4", diskless=True, persist=True)
+
+    try:
+        ds.createDimension("time", None)
+        ds.createDimension("x", params["xdim"])
+        ds.createDimension("y", params["ydim"])
+
+        # CRS attributes are set along with the data in write_payload
+        ds.createVariable("crs", "S1")
 
+        ds.createVariable("time", "f8", ("time",)).setncatts(TIME_ATTRS)
+        ds.createVariable("x", "f8", ("x",)).setncatts(X_ATTRS)
+        ds.createVariable("y", "f8", ("y",)).setncatts(Y_ATTRS)
 
-def encode_binary_to_nc(nc_path, binary_path, hemisphere):
-    """Add binary data to NetCDF file"""
+        icecon = ds.createVariable("ICECON", "u1", ("time", "y", "x"), **icecon_options)
+        icecon.setncatts(ICECON_ATTRS)
+
+        ds.setncatts(global_attrs)
+    except BaseException:
+        # Closing writes the partial skeleton to nc_path, so remove it again
+        ds.close()
+        nc_path.unlink(missing_ok=True)
+        raise
+
+    return ds
+
+
+@functools.lru_cache(maxsize=None)
+def get_coordinate_values(hemisphere):
+    """Return (x, y) grid-cell center coordinates; constant per hemisphere"""
     grid_params = get_grid_params()
     params = grid_params[hemisphere]
 
-    # Read binary data
-    with open(binary_path, "rb") as f:
-        data = np.fromfile(f, dtype=np.uint8)
+    # Set x coordinates (25km resolution)
+    xdim = params["xdim"]
+    x_vals = params["x0"] + params["dx"] * (np.arange(xdim, dtype=np.float64) + 0.5)
 
-    # Skip 300-byte header (from binary analysis)
-    grid_data = data[300:]
+    # Set y coordinates (25km resolution); dy is negative for north-up
+    ydim = params["ydim"]
+    y_vals = params["y0"] + params["dy"] * (np.arange(ydim, dtype=np.float64) + 0.5)
+
+    # The arrays are shared between calls
+    x_vals.flags.writeable = False
+    y_vals.flags.writeable = False
+
+    return x_vals, y_vals
+
+
+def read_binary_grid(binary_path, hemisphere):
+    """Read a binary file into a (ydim, xdim) uint8 grid with pole hole filled"""
+    grid_params = get_grid_params()
+    params = grid_params[hemisphere]
 
-    # Validate grid size
     expected_size = params["xdim"] * params["ydim"]
+
+    # Read binary data, skipping the 300-byte header (from binary analysis).
+    # One byte past the grid is requested so oversized files are still caught.
+    with open(binary_path, "rb") as f:
+        f.seek(300)
+        grid_data = np.fromfile(f, dtype=np.uint8, count=expected_size + 1)
+
+    # Validate grid size
     if len(grid_data) != expected_size:
         raise ValueError(
             f"Grid data size {len(grid_data)} doesn't match expected {expected_size}"
@@ -207,21 +510,50 @@ def encode_binary_to_nc(nc_path, binary_path, hemisphere):
 
     if hemisphere == "north":
         # Fill the pole hole
-        kernel = np.zeros((448, 304), dtype=np.uint8)
-        kernel[229, 150:158] = 1
-        kernel[230:238, 149:159] = 1
-        kernel[238, 150:158] = 1
-        is_pole_hole = kernel == 1
-        grid_array[is_pole_hole] = 251
-
-    # scale the binary data
-    scaled_data = grid_array * 0.004
-
-    with Dataset(nc_path, "a") as ds:
-        icecon = ds.variables["ICECON"]
-        icecon[0, :, :] = scaled_data[:, :]
-        crs_var = ds.variables["crs"]
-        crs_attrs = params["crs_attrs"]
-
-        for attr_name, attr_value in crs_attrs.items():
-            crs_var.setncattr(attr_name, attr_value)
+        grid_array[NORTH_POLE_HOLE] = 251
+
+    return grid_array
+
+
+def assemble_file_payload(binary_files, dates, hemisphere):
+    """
+    Read everything to be written to one NetCDF file into memory
+
+    Returns a dict with the dates, the x/y coordinates and a (time, y, x)
+    stack of the binary grids, one per date. Reading and validating all input
+    before the output file is touched means a bad binary never leaves a
+    half-written file behind.
+    """
+    grid_params = get_grid_params()
+    params = grid_params[hemisphere]
+    x_vals, y_vals = get_coordinate_values(hemisphere)
+
+    grids = np.empty((len(binary_files), params["ydim"], params["xdim"]), np.uint8)
+    for i, binary_file in enumerate(binary_files):
+        grids[i] = read_binary_grid(binary_file, hemisphere)
+
+    return {"time": dates, "x": x_vals, "y": y_vals, "ICECON": grids}
+
+
+def write_payload(ds, payload, hemisphere):
+    """Write an assembled payload to an open NetCDF dataset"""
+    grid_params = get_grid_params()
+    params = grid_params[hemisphere]
+
+    # Set time coordinate
+    time_var = ds.variables["time"]
+    time_var[:] = date2num(
+        payload["time"], units=time_var.units, calendar=time_var.calendar
+    )
+
+    ds.variables["x"][:] = payload["x"]
+    ds.variables["y"][:] = payload["y"]
+
+    # The binary values already are the packed ubyte ICECON values
+    # (scale_factor=0.004), so write them as-is instead of scaling to float
+    # here and letting netCDF4 pack them back
+    icecon = ds.variables["ICECON"]
+    icecon.set_auto_maskandscale(False)
+    icecon[:] = payload["ICECON"]
+
+    ds.variables["crs"].setncatts(params["crs_attrs"])